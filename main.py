@@ -6,15 +6,21 @@ Date: February 2, 2026
 This API provides endpoints for generating tokens and checksums from text.
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from pydantic import BaseModel, Field
+from fastapi import Body, FastAPI, HTTPException, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, StringConstraints
 import hashlib
-from typing import List
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from blake3 import blake3
+from typing import Annotated, List, Literal, Optional, Tuple
 import os
 from dotenv import load_dotenv
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+import anyio
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,17 +35,56 @@ PARTICIPANT_NAME = os.getenv("PARTICIPANT_NAME", "Deepak")
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+CHECKSUM_CACHE_SIZE = int(os.getenv("CHECKSUM_CACHE_SIZE", "4096"))
+CHECKSUM_CACHE_MAX_BYTES = int(os.getenv("CHECKSUM_CACHE_MAX_BYTES", "4096"))
+
+# Inputs larger than this many characters/bytes are tokenized or hashed in a
+# worker thread so they don't block the event loop. Below it the threadpool
+# handoff costs more than the work itself.
+OFFLOAD_THRESHOLD = 64 * 1024
+
+# Maximum number of texts accepted by /checksum/batch in a single request
+MAX_BATCH_SIZE = 1024
+
+# Cache-Control header for GET /generate; its response depends only on the
+# query text, so clients and proxies may reuse it
+GENERATE_CACHE_CONTROL = "public, max-age=3600"
+
+# Size of the threadpool used for sync endpoints and offloaded work
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan handler.
+
+    Resizes anyio's default thread limiter, which bounds both sync (def)
+    endpoints and run_in_threadpool calls, to THREADPOOL_SIZE.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+
 
 # Initialize FastAPI application
 app = FastAPI(
     title=APP_NAME,
     description=APP_DESCRIPTION,
     version=APP_VERSION,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+# Compress larger responses (e.g. long token lists) for clients that send
+# Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
+
 # Setup Jinja2 templates
 templates = Jinja2Templates(directory="templates")
 
+# The homepage is fully static, so render and encode it once at startup
+HOMEPAGE_BYTES = templates.get_template("index.html").render().encode("utf-8")
+
 # Mount static files for serving images, css, js, etc.
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -54,15 +99,38 @@ class TextInput(BaseModel):
 
     Attributes:
         text (str): The input text to be processed
+        text_bytes (bytes): The UTF-8 encoding of text (cached)
     """
 
-    text: str = Field(..., description="The text to generate tokens from", min_length=1)
+    model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=False)
+
+    text: Annotated[
+        str,
+        StringConstraints(min_length=1),
+        Field(description="The text to generate tokens from"),
+    ]
+
+    # (text, encoded bytes) pair; keyed on the text object so a model_copy
+    # with an updated text never reuses the previous encoding
+    _text_bytes: Optional[Tuple[str, bytes]] = PrivateAttr(default=None)
+
+    @property
+    def text_bytes(self) -> bytes:
+        """UTF-8 encoded text, computed once per text value."""
+        cached = self._text_bytes
+        if cached is None or cached[0] is not self.text:
+            cached = (self.text, self.text.encode("utf-8"))
+            self._text_bytes = cached
+        return cached[1]
 
 
 class TokenResponse(BaseModel):
     """
     Model for token response.
 
+    Used to document the response in the OpenAPI schema; handlers return
+    an ORJSONResponse directly, bypassing FastAPI's response serialization.
+
     Attributes:
         tokens (List[str]): List of generated tokens
         count (int): Number of tokens generated
@@ -76,8 +144,11 @@ class ChecksumResponse(BaseModel):
     """
     Model for checksum response.
 
+    Used to document the response in the OpenAPI schema; handlers return
+    an ORJSONResponse directly, bypassing FastAPI's response serialization.
+
     Attributes:
-        checksum (str): MD5 checksum of the input text
+        checksum (str): Checksum of the input text (MD5 by default)
         original_text (str): The original input text
     """
 
@@ -85,13 +156,17 @@ class ChecksumResponse(BaseModel):
     original_text: str
 
 
+# Supported checksum algorithms for the /checksum endpoint
+ChecksumAlgorithm = Literal["md5", "blake3"]
+
+
 def generate(text: str) -> List[str]:
     """
     Generate tokens from the input text by splitting on whitespace.
 
     This function takes a string as input and splits it into individual tokens
-    based on whitespace characters. Each token is stripped of leading/trailing
-    whitespace.
+    based on runs of whitespace characters. Leading/trailing whitespace never
+    produces empty tokens.
 
     Args:
         text (str): The input text to tokenize
@@ -103,24 +178,125 @@ def generate(text: str) -> List[str]:
         >>> generate("Hello World")
         ['Hello', 'World']
     """
-    # Split text by whitespace and filter out empty strings
-    tokens = [token.strip() for token in text.split() if token.strip()]
-    return tokens
+    # str.split() with no separator already collapses whitespace runs
+    # and never yields empty strings
+    return text.split()
+
+
+def _hash_hex(data: bytes, algo: ChecksumAlgorithm) -> str:
+    """Hash data with the given algorithm and return the hex digest."""
+    if algo == "blake3":
+        return blake3(data).hexdigest(length=16)
+    return hashlib.md5(data).hexdigest()
+
+
+# Memoized variant used for small inputs; repeated payloads (retries, health
+# probes, duplicate uploads) skip hashing entirely
+_cached_hash_hex = lru_cache(maxsize=CHECKSUM_CACHE_SIZE)(_hash_hex)
+
+
+def compute_checksum(data: bytes, algo: ChecksumAlgorithm = "md5") -> str:
+    """
+    Compute a hex checksum of the given bytes.
+
+    MD5 is the default to keep existing checksums stable. BLAKE3 is a much
+    faster SIMD-accelerated alternative for callers that don't need MD5
+    compatibility; its digest is truncated to 16 bytes so both algorithms
+    return a 32-character hex string.
+
+    Results for inputs up to CHECKSUM_CACHE_MAX_BYTES are kept in an LRU
+    cache of CHECKSUM_CACHE_SIZE entries. Larger inputs are always hashed
+    so the cache cannot pin large payloads in memory.
+
+    Args:
+        data (bytes): The bytes to hash
+        algo (str): Hash algorithm to use, either "md5" or "blake3"
+
+    Returns:
+        str: The hex-encoded checksum
+
+    Example:
+        >>> compute_checksum(b"Hello World")
+        'b10a8db164e0754105b7a99be72e3fe5'
+    """
+    if len(data) <= CHECKSUM_CACHE_MAX_BYTES:
+        return _cached_hash_hex(data, algo)
+    return _hash_hex(data, algo)
+
+
+def checksum_many(batch: List[bytes], algo: ChecksumAlgorithm = "md5") -> List[str]:
+    """
+    Compute hex checksums for a batch of inputs.
+
+    Args:
+        batch (List[bytes]): The inputs to hash
+        algo (str): Hash algorithm to use, either "md5" or "blake3"
+
+    Returns:
+        List[str]: The hex-encoded checksums, in input order
+    """
+    return [compute_checksum(data, algo) for data in batch]
+
+
+def generate_etag(text: str, version: str = APP_VERSION) -> str:
+    """
+    Build the weak ETag for a /generate response.
+
+    The tag covers the application version as well as the text, so a deploy
+    that changes the tokenizer or response shape invalidates cached copies.
+
+    Args:
+        text (str): The query text the response was generated from
+        version (str): Representation version, defaults to APP_VERSION
+
+    Returns:
+        str: A weak entity tag of the form W/"<md5>"
+    """
+    return f'W/"{compute_checksum(f"{version}:{text}".encode("utf-8"))}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison.
+
+    Weak comparison ignores the W/ prefix, as RFC 9110 requires for
+    If-None-Match, and the header may list several tags or be "*".
+
+    Args:
+        if_none_match (str): The If-None-Match request header value
+        etag (str): The current entity tag of the resource
+
+    Returns:
+        bool: True if any listed tag matches the ETag
+    """
+    current = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == current:
+            return True
+    return False
 
 
 @app.get("/generate")
-async def generate_tokens_from_query(text: str):
+def generate_tokens_from_query(text: str, request: Request):
     """
     Generate tokens from text provided as a query parameter.
 
     This endpoint accepts text as a query parameter and returns
-    a list of tokens generated from that text.
+    a list of tokens generated from that text. It is a plain function,
+    so Starlette runs it in the threadpool instead of on the event loop.
+
+    Responses carry a Cache-Control header and a weak ETag derived from
+    the app version and the text. It is weak because GZipMiddleware may send a gzip-encoded
+    representation with the same tag. A request whose If-None-Match
+    matches gets an empty 304 reply.
 
     Args:
         text (str): The text to tokenize (query parameter)
+        request: FastAPI Request object
 
     Returns:
-        dict: Contains the list of tokens and their count
+        ORJSONResponse: Contains the list of tokens and their count
 
     Raises:
         HTTPException: If text parameter is empty or missing
@@ -132,11 +308,18 @@ async def generate_tokens_from_query(text: str):
     if not text or not text.strip():
         raise HTTPException(status_code=400, detail="Text parameter cannot be empty")
 
+    etag = generate_etag(text)
+    cache_headers = {"ETag": etag, "Cache-Control": GENERATE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=cache_headers)
+
     tokens = generate(text)
-    return {"tokens": tokens, "count": len(tokens)}
+    return ORJSONResponse(
+        {"tokens": tokens, "count": len(tokens)}, headers=cache_headers
+    )
 
 
-@app.post("/tokenize", response_model=TokenResponse)
+@app.post("/tokenize", responses={200: {"model": TokenResponse}})
 async def tokenize_text(input_data: TextInput):
     """
     Generate tokens from text provided in JSON body.
@@ -148,7 +331,7 @@ async def tokenize_text(input_data: TextInput):
         input_data (TextInput): Pydantic model containing the text field
 
     Returns:
-        TokenResponse: Contains the list of tokens and their count
+        ORJSONResponse: Contains the list of tokens and their count (TokenResponse shape)
 
     Raises:
         HTTPException: If text is empty after stripping whitespace
@@ -161,49 +344,102 @@ async def tokenize_text(input_data: TextInput):
     if not input_data.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-    # Use the generate() function to create tokens
-    tokens = generate(input_data.text)
+    # Use the generate() function to create tokens, off the event loop for
+    # large inputs
+    if len(input_data.text) > OFFLOAD_THRESHOLD:
+        tokens = await run_in_threadpool(generate, input_data.text)
+    else:
+        tokens = generate(input_data.text)
 
-    return TokenResponse(tokens=tokens, count=len(tokens))
+    # Return the response directly so orjson encodes the token list without
+    # FastAPI's jsonable_encoder pass
+    return ORJSONResponse({"tokens": tokens, "count": len(tokens)})
 
 
-@app.post("/checksum", response_model=ChecksumResponse)
-async def generate_checksum(input_data: TextInput):
+@app.post("/checksum", responses={200: {"model": ChecksumResponse}})
+async def generate_checksum(input_data: TextInput, algo: ChecksumAlgorithm = "md5"):
     """
     Generate MD5 checksum from text provided in JSON body.
 
     This endpoint accepts a POST request with a JSON body containing
-    a 'text' field and returns the MD5 checksum of that text.
+    a 'text' field and returns the MD5 checksum of that text. Pass
+    ``algo=blake3`` as a query parameter for a faster BLAKE3 checksum.
 
     Args:
         input_data (TextInput): Pydantic model containing the text field
+        algo (str): Hash algorithm to use (query parameter, default "md5")
 
     Returns:
-        ChecksumResponse: Contains the checksum and original text
+        ORJSONResponse: Contains the checksum and original text (ChecksumResponse shape)
 
     Example:
         POST /checksum
         Body: {"text": "Hello World"}
         Returns: {"checksum": "b10a8db164e0754105b7a99be72e3fe5", "original_text": "Hello World"}
     """
-    # Generate MD5 checksum of the input text
-    checksum = hashlib.md5(input_data.text.encode()).hexdigest()
+    # Generate checksum of the UTF-8 encoded input text, off the event loop
+    # for large inputs
+    data = input_data.text_bytes
+    if len(data) > OFFLOAD_THRESHOLD:
+        checksum = await run_in_threadpool(compute_checksum, data, algo)
+    else:
+        checksum = compute_checksum(data, algo)
+
+    return ORJSONResponse({"checksum": checksum, "original_text": input_data.text})
+
+
+@app.post("/checksum/batch", responses={200: {"model": List[ChecksumResponse]}})
+async def generate_checksum_batch(
+    items: Annotated[List[TextInput], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    algo: ChecksumAlgorithm = "md5",
+):
+    """
+    Generate checksums for many texts in a single request.
 
-    return ChecksumResponse(checksum=checksum, original_text=input_data.text)
+    This endpoint accepts a POST request with a JSON array of objects, each
+    containing a 'text' field, and returns one checksum per item in the
+    same order. At most MAX_BATCH_SIZE items are accepted per request.
+
+    Args:
+        items (List[TextInput]): The texts to checksum
+        algo (str): Hash algorithm to use (query parameter, default "md5")
+
+    Returns:
+        ORJSONResponse: One checksum and original text per item (ChecksumResponse shape)
+
+    Example:
+        POST /checksum/batch
+        Body: [{"text": "Hello"}, {"text": "World"}]
+        Returns: [{"checksum": "8b1a9953c4611296a827abf8c47804d7", "original_text": "Hello"}, ...]
+    """
+    encoded = [item.text_bytes for item in items]
+
+    # Hash the whole batch off the event loop when it is large
+    if sum(len(data) for data in encoded) > OFFLOAD_THRESHOLD:
+        checksums = await run_in_threadpool(checksum_many, encoded, algo)
+    else:
+        checksums = checksum_many(encoded, algo)
+
+    return ORJSONResponse(
+        [
+            {"checksum": checksum, "original_text": item.text}
+            for checksum, item in zip(checksums, items)
+        ]
+    )
 
 
 @app.get("/", response_class=HTMLResponse)
-async def homepage(request: Request):
+async def homepage():
     """
     Homepage endpoint that returns the custom HTML UI.
 
-    Args:
-        request: FastAPI Request object
+    The page is pre-rendered at startup (HOMEPAGE_BYTES), so no template
+    rendering or encoding happens per request.
 
     Returns:
         HTMLResponse: Custom homepage with UI
     """
-    return templates.TemplateResponse(request=request, name="index.html")
+    return HTMLResponse(content=HOMEPAGE_BYTES)
 
 
 # Entry point for running the application
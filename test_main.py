@@ -8,7 +8,11 @@ using the FastAPI TestClient.
 """
 
 from fastapi.testclient import TestClient
-from main import app, generate
+from main import app, generate, generate_etag, compute_checksum, TextInput
+import main
+import anyio
+import fastapi.routing
+import hashlib
 import pytest
 
 # Create a test client for the FastAPI application
@@ -61,6 +65,64 @@ class TestGenerateFunction:
         assert len(result) == 1
 
 
+class TestComputeChecksumFunction:
+    """Test cases for the compute_checksum() function"""
+
+    def test_compute_checksum_md5(self):
+        """Test MD5 checksum of known input"""
+        assert compute_checksum(b"Hello World") == "b10a8db164e0754105b7a99be72e3fe5"
+
+    def test_compute_checksum_small_input_is_cached(self):
+        """Test that repeated small inputs are served from the cache"""
+        main._cached_hash_hex.cache_clear()
+        compute_checksum(b"cache me")
+        compute_checksum(b"cache me")
+        info = main._cached_hash_hex.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_compute_checksum_large_input_not_cached(self):
+        """Test that inputs above the size limit bypass the cache"""
+        main._cached_hash_hex.cache_clear()
+        data = b"x" * (main.CHECKSUM_CACHE_MAX_BYTES + 1)
+        assert compute_checksum(data) == compute_checksum(data)
+        assert main._cached_hash_hex.cache_info().currsize == 0
+
+
+class TestTextInputModel:
+    """Test cases for the TextInput model"""
+
+    def test_text_bytes_is_utf8_encoded(self):
+        """Test that text_bytes returns the UTF-8 encoding of text"""
+        model = TextInput(text="héllo wörld")
+        assert model.text_bytes == "héllo wörld".encode("utf-8")
+
+    def test_text_bytes_is_cached(self):
+        """Test that text_bytes is only encoded once per instance"""
+        model = TextInput(text="Hello World")
+        assert model.text_bytes is model.text_bytes
+
+    def test_text_bytes_not_stale_after_copy(self):
+        """Test that a copy with updated text re-encodes the new text"""
+        model = TextInput(text="x")
+        assert model.text_bytes == b"x"
+        copy = model.model_copy(update={"text": "y"})
+        assert copy.text_bytes == b"y"
+        assert model.text_bytes == b"x"
+
+
+class TestLifespan:
+    """Test cases for application startup configuration"""
+
+    def test_threadpool_size_configured(self):
+        """Test that startup resizes the default threadpool"""
+        with TestClient(app) as lifespan_client:
+            limiter = lifespan_client.portal.call(
+                anyio.to_thread.current_default_thread_limiter
+            )
+            assert limiter.total_tokens == main.THREADPOOL_SIZE
+
+
 class TestGenerateEndpoint:
     """Test cases for the /generate GET endpoint"""
 
@@ -82,6 +144,66 @@ class TestGenerateEndpoint:
         assert data["tokens"] == ["FastAPI", "is", "awesome"]
         assert data["count"] == 3
 
+    def test_generate_endpoint_cache_headers(self):
+        """Test that responses carry caching headers"""
+        response = client.get("/generate?text=Hello World")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=3600"
+        assert response.headers["etag"] == generate_etag("Hello World")
+        assert response.headers["etag"].startswith('W/"')
+
+    def test_generate_etag_depends_on_version(self):
+        """Test that a different app version produces a different ETag"""
+        assert generate_etag("Hello World", "1.0.0") != generate_etag(
+            "Hello World", "1.0.1"
+        )
+        assert generate_etag("Hello World", "1.0.0") == generate_etag(
+            "Hello World", "1.0.0"
+        )
+
+    def test_generate_endpoint_not_modified(self):
+        """Test that a matching If-None-Match returns 304"""
+        etag = client.get("/generate?text=Hello World").headers["etag"]
+        response = client.get(
+            "/generate?text=Hello World", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+    def test_generate_endpoint_not_modified_weak_comparison(self):
+        """Test that If-None-Match is compared weakly and may list several tags"""
+        etag = client.get("/generate?text=Hello World").headers["etag"]
+        strong = etag.removeprefix("W/")
+        response = client.get(
+            "/generate?text=Hello World",
+            headers={"If-None-Match": f'"other", {strong}'},
+        )
+        assert response.status_code == 304
+
+    def test_generate_endpoint_modified(self):
+        """Test that a non-matching If-None-Match returns the full response"""
+        response = client.get(
+            "/generate?text=Hello World", headers={"If-None-Match": 'W/"other"'}
+        )
+        assert response.status_code == 200
+        assert response.json()["count"] == 2
+
+    def test_generate_endpoint_gzip_uses_weak_etag(self):
+        """Test that gzip-encoded responses carry a weak validator"""
+        text = " ".join(["token"] * 300)
+        response = client.get(
+            "/generate", params={"text": text}, headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].startswith('W/"')
+        assert response.json()["count"] == 300
+
+        headers = {"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+        revalidated = client.get("/generate", params={"text": text}, headers=headers)
+        assert revalidated.status_code == 304
+
     def test_generate_endpoint_empty_text(self):
         """Test endpoint with empty text parameter"""
         response = client.get("/generate?text=")
@@ -118,6 +240,31 @@ class TestTokenizeEndpoint:
         response = client.post("/tokenize", json={"text": ""})
         assert response.status_code == 422  # Validation error due to min_length=1
 
+    def test_tokenize_large_text(self):
+        """Test tokenization of text large enough to be offloaded to a thread"""
+        text = "word " * (main.OFFLOAD_THRESHOLD // 5 + 1)
+        response = client.post("/tokenize", json={"text": text})
+        assert response.status_code == 200
+        assert response.json()["count"] == main.OFFLOAD_THRESHOLD // 5 + 1
+
+    def test_tokenize_large_response_is_gzipped(self):
+        """Test that large responses are gzip-compressed when accepted"""
+        text = "token " * 200
+        response = client.post(
+            "/tokenize", json={"text": text}, headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["count"] == 200
+
+    def test_tokenize_small_response_not_gzipped(self):
+        """Test that small responses are sent uncompressed"""
+        response = client.post(
+            "/tokenize", json={"text": "Hello"}, headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
     def test_tokenize_whitespace_only(self):
         """Test tokenization with whitespace-only text"""
         response = client.post("/tokenize", json={"text": "   "})
@@ -133,6 +280,11 @@ class TestTokenizeEndpoint:
         response = client.post("/tokenize", json={"invalid_field": "test"})
         assert response.status_code == 422
 
+    def test_tokenize_extra_field(self):
+        """Test request with an unexpected extra field"""
+        response = client.post("/tokenize", json={"text": "Hello", "extra": 1})
+        assert response.status_code == 422
+
 
 class TestChecksumEndpoint:
     """Test cases for the /checksum POST endpoint"""
@@ -172,6 +324,91 @@ class TestChecksumEndpoint:
         response = client.post("/checksum", json={"text": ""})
         assert response.status_code == 422  # Validation error
 
+    def test_checksum_large_text(self):
+        """Test checksum of text large enough to be offloaded to a thread"""
+        text = "a" * (main.OFFLOAD_THRESHOLD + 1)
+        response = client.post("/checksum", json={"text": text})
+        assert response.status_code == 200
+        assert response.json()["checksum"] == hashlib.md5(text.encode()).hexdigest()
+
+    def test_checksum_blake3(self):
+        """Test checksum generation with the BLAKE3 algorithm"""
+        response = client.post("/checksum?algo=blake3", json={"text": "Hello World"})
+        assert response.status_code == 200
+        # BLAKE3 of "Hello World", truncated to 16 bytes
+        assert response.json()["checksum"] == "41f8394111eb713a22165c46c90ab8f0"
+
+    def test_checksum_unknown_algorithm(self):
+        """Test checksum with an unsupported algorithm"""
+        response = client.post("/checksum?algo=sha1", json={"text": "Hello World"})
+        assert response.status_code == 422
+
+
+class TestChecksumBatchEndpoint:
+    """Test cases for the /checksum/batch POST endpoint"""
+
+    def test_checksum_batch_success(self):
+        """Test checksums for several texts in one request"""
+        response = client.post(
+            "/checksum/batch", json=[{"text": "Hello World"}, {"text": "Hello"}]
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 2
+        assert data[0]["checksum"] == "b10a8db164e0754105b7a99be72e3fe5"
+        assert data[0]["original_text"] == "Hello World"
+        assert data[1]["checksum"] == hashlib.md5(b"Hello").hexdigest()
+
+    def test_checksum_batch_matches_single(self):
+        """Test that batch checksums match the single-text endpoint"""
+        single = client.post("/checksum?algo=blake3", json={"text": "FastAPI"})
+        batch = client.post("/checksum/batch?algo=blake3", json=[{"text": "FastAPI"}])
+        assert batch.status_code == 200
+        assert batch.json()[0]["checksum"] == single.json()["checksum"]
+
+    def test_checksum_batch_empty_list(self):
+        """Test batch request with no items"""
+        response = client.post("/checksum/batch", json=[])
+        assert response.status_code == 422
+
+    def test_checksum_batch_too_large(self):
+        """Test batch request exceeding the maximum batch size"""
+        items = [{"text": "x"}] * (main.MAX_BATCH_SIZE + 1)
+        response = client.post("/checksum/batch", json=items)
+        assert response.status_code == 422
+
+    def test_checksum_batch_empty_text(self):
+        """Test batch request containing an empty text"""
+        response = client.post("/checksum/batch", json=[{"text": "ok"}, {"text": ""}])
+        assert response.status_code == 422
+
+
+class TestResponseSerialization:
+    """Test that JSON endpoints bypass FastAPI's jsonable_encoder pass"""
+
+    @pytest.mark.parametrize(
+        "method, url, body",
+        [
+            ("get", "/generate?text=Hello World", None),
+            ("post", "/tokenize", {"text": "Hello World"}),
+            ("post", "/checksum", {"text": "Hello World"}),
+            ("post", "/checksum/batch", [{"text": "Hello"}, {"text": "World"}]),
+        ],
+    )
+    def test_response_not_routed_through_jsonable_encoder(
+        self, monkeypatch, method, url, body
+    ):
+        """Test that handler results are encoded by orjson directly"""
+        calls = []
+        monkeypatch.setattr(
+            fastapi.routing,
+            "jsonable_encoder",
+            lambda *args, **kwargs: calls.append(args),
+        )
+        response = client.request(method, url, json=body)
+        assert response.status_code == 200
+        assert calls == []
+
 
 class TestAPIDocumentation:
     """Test cases for API documentation and metadata"""
@@ -184,6 +421,14 @@ class TestAPIDocumentation:
         assert "info" in schema
         assert schema["info"]["title"] == "Token Generation API"
 
+    def test_openapi_documents_response_models(self):
+        """Test that response models are still described in the schema"""
+        schema = client.get("/openapi.json").json()
+        tokenize = schema["paths"]["/tokenize"]["post"]["responses"]["200"]
+        ref = tokenize["content"]["application/json"]["schema"]["$ref"]
+        assert ref.endswith("/TokenResponse")
+        assert "ChecksumResponse" in schema["components"]["schemas"]
+
     def test_docs_endpoint_available(self):
         """Test that Swagger UI documentation is accessible"""
         response = client.get("/docs")